@@ -0,0 +1,162 @@
+import threading
+import time
+from collections import deque
+
+# -----------------------------
+# Admission control for model calls
+# -----------------------------
+# Kept free of Streamlit so it can be driven with a fake clock.
+
+
+class TokenBucket:
+    def __init__(self, rate, capacity, clock=time.monotonic):
+        # rate is tokens per second, capacity is the burst size
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.tokens = float(capacity)
+        self.updated = clock()
+
+    def _refill(self):
+        now = self.clock()
+        elapsed = max(0.0, now - self.updated)
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.updated = now
+
+    def try_take(self, n=1):
+        self._refill()
+        if self.tokens >= n:
+            self.tokens -= n
+            return True
+        return False
+
+    def retry_after(self, n=1):
+        # seconds until n tokens are available
+        self._refill()
+        missing = n - self.tokens
+        if missing <= 0:
+            return 0.0
+        return missing / self.rate
+
+
+class Ticket:
+    def __init__(self, user):
+        self.user = user
+        self.admitted = False
+
+
+class Rejected:
+    def __init__(self, reason, retry_after):
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Per-client and global token buckets in front of a model call.
+
+    "user" is whatever key the caller trusts to identify a client (the
+    app passes the Streamlit session id). Each key holds at most one spot
+    in a bounded FIFO queue, and the global bucket decides when the head
+    of the queue may go.
+    """
+
+    def __init__(
+        self,
+        user_rate,
+        user_burst,
+        global_rate,
+        global_burst,
+        max_queue,
+        clock=time.monotonic
+    ):
+        self.user_rate = user_rate
+        self.user_burst = user_burst
+        self.max_queue = max_queue
+        self.clock = clock
+
+        self._global = TokenBucket(global_rate, global_burst, clock)
+        self._users = {}
+        self._last_prune = clock()
+        self._queue = deque()
+        self._lock = threading.Lock()
+
+    def _prune(self):
+        # a bucket back at capacity is the same as a fresh one, so drop it;
+        # checked at most once per full refill so this stays cheap
+        now = self.clock()
+        if now - self._last_prune < self.user_burst / self.user_rate:
+            return
+        self._last_prune = now
+
+        for user, bucket in list(self._users.items()):
+            bucket._refill()
+            if bucket.tokens >= bucket.capacity:
+                del self._users[user]
+
+    def _user_bucket(self, user):
+        bucket = self._users.get(user)
+        if bucket is None:
+            bucket = TokenBucket(self.user_rate, self.user_burst, self.clock)
+            self._users[user] = bucket
+        return bucket
+
+    def enqueue(self, user):
+        # returns a Ticket, or Rejected with a retry-after in seconds
+        with self._lock:
+            self._prune()
+
+            if any(t.user == user for t in self._queue):
+                return Rejected("already_queued", self._estimated_wait(len(self._queue)))
+
+            if len(self._queue) >= self.max_queue:
+                return Rejected("overloaded", self._estimated_wait(len(self._queue) + 1))
+
+            bucket = self._user_bucket(user)
+            if not bucket.try_take():
+                return Rejected("user_limit", bucket.retry_after())
+
+            ticket = Ticket(user)
+            self._queue.append(ticket)
+            return ticket
+
+    def poll(self, ticket):
+        # 0 once the ticket is admitted, otherwise its 1-based queue position
+        with self._lock:
+            if ticket.admitted:
+                return 0
+
+            position = self._position(ticket)
+            if position is None:
+                return None
+
+            if position == 1 and self._global.try_take():
+                self._queue.popleft()
+                ticket.admitted = True
+                return 0
+
+            return position
+
+    def cancel(self, ticket):
+        with self._lock:
+            if ticket in self._queue:
+                self._queue.remove(ticket)
+
+    def queue_length(self):
+        with self._lock:
+            return len(self._queue)
+
+    def estimated_wait(self):
+        # seconds until a newcomer would reach the front of the queue
+        with self._lock:
+            return self._estimated_wait(len(self._queue) + 1)
+
+    def _position(self, ticket):
+        for i, t in enumerate(self._queue, start=1):
+            if t is ticket:
+                return i
+        return None
+
+    def _estimated_wait(self, ahead):
+        # rough estimate: everyone ahead needs one global token
+        return self._global.retry_after(1) + max(0, ahead - 1) / self._global.rate
@@ -4,8 +4,25 @@ from datetime import datetime
 from collections import defaultdict
 import os
 import base64
+import time
+import sys
+import threading
+import cProfile
+import pstats
+import hmac
+import functools
+import logging
+from collections import Counter
+from PIL import Image
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 from openai import OpenAI
+from admission import AdmissionController, Rejected
+import rollups
+from photos import PhotoResultCache, prepare_photo
+from result_cache import ResultCache
+import scoring
 client = OpenAI()
+logger = logging.getLogger(__name__)
 
 # -----------------------------
 # MUST BE FIRST — ONLY ONCE
@@ -18,17 +35,330 @@ st.set_page_config(
     layout="wide"
 )
 
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# -----------------------------
+# Config
+# -----------------------------
+# Set these in the environment, e.g. BIRD_HUNT_DEV_MODE=1 while developing.
+
+# caching is ON unless dev mode is explicitly enabled
+DEV_MODE = os.environ.get("BIRD_HUNT_DEV_MODE", "0") == "1"
+
+# the profiling tools unlock with this token; unset means no admin tools
+ADMIN_TOKEN = os.environ.get("BIRD_HUNT_ADMIN_TOKEN", "")
+
+PROFILE_DIR = os.environ.get(
+    "BIRD_HUNT_PROFILE_DIR",
+    os.path.join(BASE_DIR, "profiles")
+)
+
+PAGES = ["📝 Submit Bird", "🏆 Leaderboard", "📚 Lifetime Stats", "📈 Trends", "🖼️ Full Species List"]
+
+# -----------------------------
+# Profiling (admin only)
+# -----------------------------
+# A capture profiles the next N reruns of one page. A full rerun is
+# started here at the top of the script and stopped at the bottom, or at
+# the start of the next rerun if st.stop()/st.rerun() cut it short.
+# Fragment reruns never reach those hooks, so the pages wrap themselves
+# in @profiled instead.
+
+PROFILE_MODES = {
+    "cProfile (.pstats)": "cprofile",
+    "Sampling (.collapsed)": "sampling",
+}
+
+SAMPLE_INTERVAL = 0.005  # seconds
+
+
+class StackSampler(threading.Thread):
+    # samples the script thread's stack into flamegraph-ready counts
+
+    def __init__(self, thread_id, interval=SAMPLE_INTERVAL):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._done = threading.Event()
+
+    def run(self):
+        while not self._done.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(
+                    f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+                )
+                frame = frame.f_back
+
+            self.stacks[";".join(reversed(names))] += 1
+
+    def stop(self):
+        self._done.set()
+        self.join()
+
+
+def _current_page():
+    return (
+        st.session_state.get("_navigate_to")
+        or st.session_state.get("choice")
+        or PAGES[0]
+    )
+
+
+PROFILE_SLOT_STALE = 120  # seconds before an abandoned cProfile hold is taken back
+
+
+def current_session_id():
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx else "local"
+
+
+class CProfileSlot:
+    # cProfile hooks the whole interpreter on Python 3.12+, so only one
+    # session at a time may run it. Remembering who holds it and since
+    # when lets a hold left behind by a closed tab be reclaimed.
+
+    def __init__(self, stale_after=PROFILE_SLOT_STALE):
+        self.stale_after = stale_after
+        self.owner = None
+        self.since = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self, owner):
+        with self._lock:
+            now = time.monotonic()
+            if self.owner not in (None, owner) and now - self.since < self.stale_after:
+                return False
+            self.owner = owner
+            self.since = now
+            return True
+
+    def release(self, owner):
+        with self._lock:
+            if self.owner == owner:
+                self.owner = None
+
+
+@st.cache_resource
+def get_cprofile_slot():
+    return CProfileSlot()
+
+
+def start_profile_run():
+    # close out a run that never reached the end of the script
+    stop_profile_run()
+
+    prof = st.session_state.get("profiling")
+    if not prof or prof["page"] != _current_page():
+        return
+
+    if prof["mode"] == "cprofile":
+        slot = get_cprofile_slot()
+        if not slot.acquire(current_session_id()):
+            prof["blocked"] = True
+            return
+
+        active = cProfile.Profile()
+        try:
+            active.enable()
+        except ValueError:
+            # another profiler is still running in this process
+            slot.release(current_session_id())
+            prof["blocked"] = True
+            return
+        prof["blocked"] = False
+    else:
+        active = StackSampler(threading.get_ident())
+        active.start()
+
+    prof["active"] = active
+
+
+def stop_profile_run():
+    # returns True when this run completed the capture
+    prof = st.session_state.get("profiling")
+    if not prof or prof.get("active") is None:
+        return False
+
+    active = prof["active"]
+    prof["active"] = None
+
+    if prof["mode"] == "cprofile":
+        active.disable()
+        get_cprofile_slot().release(current_session_id())
+        if prof["stats"] is None:
+            prof["stats"] = pstats.Stats(active)
+        else:
+            prof["stats"].add(active)
+    else:
+        active.stop()
+        prof["stacks"].update(active.stacks)
+
+    prof["runs_done"] += 1
+    if prof["runs_done"] >= prof["runs"]:
+        st.session_state["profile_result"] = save_profile(prof)
+        del st.session_state["profiling"]
+        return True
+
+    return False
+
+
+def profiled(page):
+    @functools.wraps(page)
+    def wrapper(*args, **kwargs):
+        prof = st.session_state.get("profiling")
+        if prof and prof.get("active") is not None:
+            # full rerun, the module-level hooks already cover it
+            return page(*args, **kwargs)
+
+        start_profile_run()
+        try:
+            result = page(*args, **kwargs)
+        finally:
+            capture_done = stop_profile_run()
+
+        if capture_done:
+            # the sidebar was drawn before the capture finished
+            st.rerun(scope="app")
+        return result
+
+    return wrapper
+
+
+def save_profile(prof, top_n=10):
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+
+    page_slug = prof["page"].split(" ", 1)[-1].lower().replace(" ", "-")
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    base = os.path.join(PROFILE_DIR, f"{page_slug}-{stamp}")
+
+    if prof["mode"] == "cprofile":
+        path = base + ".pstats"
+        prof["stats"].dump_stats(path)
+
+        # hottest by self time
+        rows = sorted(
+            prof["stats"].stats.items(),
+            key=lambda kv: kv[1][2],
+            reverse=True
+        )
+        top = [
+            (f"{func} ({os.path.basename(file)}:{line})", f"{tt * 1000:.1f} ms")
+            for (file, line, func), (_, _, tt, _, _) in rows[:top_n]
+        ]
+    else:
+        path = base + ".collapsed"
+        with open(path, "w") as f:
+            for stack, count in prof["stacks"].most_common():
+                f.write(f"{stack} {count}\n")
+
+        # hottest by samples where the function was on top of the stack
+        leaves = Counter()
+        for stack, count in prof["stacks"].items():
+            leaves[stack.rsplit(";", 1)[-1]] += count
+        top = [
+            (name, f"{count} samples")
+            for name, count in leaves.most_common(top_n)
+        ]
+
+    return {
+        "page": prof["page"],
+        "runs": prof["runs_done"],
+        "path": path,
+        "top": top,
+    }
+
+
+def is_admin():
+    if not ADMIN_TOKEN:
+        return False
+    if st.session_state.get("is_admin"):
+        return True
+
+    token = st.sidebar.text_input("Admin token", type="password", key="admin_token")
+    if token and hmac.compare_digest(token.encode(), ADMIN_TOKEN.encode()):
+        st.session_state["is_admin"] = True
+        return True
+    return False
+
+
+def profiling_sidebar():
+    with st.sidebar.expander("🔬 Profiling", expanded="profiling" in st.session_state):
+        prof = st.session_state.get("profiling")
+
+        if prof:
+            st.write(
+                f"Capturing **{prof['page']}** — "
+                f"{prof['runs_done']}/{prof['runs']} reruns"
+            )
+            if prof.get("blocked"):
+                st.caption("⏸ Another session is using cProfile — waiting for it to finish.")
+            if st.button("Cancel capture"):
+                stop_profile_run()
+                st.session_state.pop("profiling", None)
+        else:
+            page = st.selectbox("Page", PAGES, key="profile_page")
+            mode = st.radio(
+                "Profiler",
+                list(PROFILE_MODES),
+                key="profile_mode",
+                help="cProfile runs one capture at a time per server and on Python 3.12+ also sees other sessions. The sampler only watches this session."
+            )
+            runs = st.number_input("Reruns", min_value=1, max_value=20, value=3, key="profile_runs")
+
+            if st.button("Start capture"):
+                st.session_state["profiling"] = {
+                    "page": page,
+                    "mode": PROFILE_MODES[mode],
+                    "runs": int(runs),
+                    "runs_done": 0,
+                    "active": None,
+                    "stats": None,
+                    "stacks": Counter(),
+                    "blocked": False,
+                }
+                st.caption("Interact with the page to record reruns.")
+
+        result = st.session_state.get("profile_result")
+        if result:
+            st.markdown(
+                f"**Last capture:** {result['page']} ({result['runs']} reruns)"
+            )
+            st.caption(result["path"])
+
+            for name, value in result["top"]:
+                st.markdown(f"- `{name}` — {value}")
+
+            with open(result["path"], "rb") as f:
+                st.download_button(
+                    "Download profile",
+                    f.read(),
+                    file_name=os.path.basename(result["path"]),
+                )
+
+
+start_profile_run()
+
 # -----------------------------
 # Global CSS (background + frame)
 # -----------------------------
 
 
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 BACKGROUND_PATH = os.path.join(BASE_DIR, "assets", "background3.png")
 
-def set_background(image_path: str):
+@st.cache_resource
+def _encode_image(image_path: str):
     with open(image_path, "rb") as f:
-        encoded = base64.b64encode(f.read()).decode()
+        return base64.b64encode(f.read()).decode()
+
+def set_background(image_path: str):
+    encoded = _encode_image(image_path)
 
     st.markdown(f"""
     <style>
@@ -101,12 +431,6 @@ content = st.container()
 
 st.title("🐦 Bird Hunt")
 
-DEV_MODE = st.sidebar.checkbox(
-    "🛠 Dev mode (disable cache)",
-    value=True,
-    help="Turn ON while developing. Turn OFF for speed."
-)
-
 st.markdown(
     """
 **Objective:** Spot and log the most unique bird species in NYC each week.  
@@ -130,69 +454,111 @@ def show_bird_image(bird_name: str):
         st.caption("🖼️ No image available")
 
 DATA_FILE = "submissions.json"
+ROLLUP_FILE = "rollups.json"
 
 # -----------------------------
-# Bird rarity + points (MVP)
+# Bird rarity + points
 # -----------------------------
+# Tiers live in seasons.json, one table per season. Edit the file and the
+# app picks it up on the next rerun; every score is recomputed from it.
+
+SEASONS_FILE = os.path.join(BASE_DIR, "seasons.json")
+
+
+@st.cache_resource
+def _scoring_state():
+    # the last good compiled table, shared by every session
+    return {
+        "lock": threading.Lock(),
+        "table": None,
+        "table_version": None,  # mtime of the file `table` came from
+        "seen_version": None,   # mtime of the last file we tried
+        "error": None,
+    }
+
+
+def get_scoring():
+    state = _scoring_state()
+    try:
+        version = os.path.getmtime(SEASONS_FILE)
+    except OSError as e:
+        version = None
+        state["error"] = f"can't read {SEASONS_FILE}: {e}"
+
+    if version is not None and version != state["seen_version"]:
+        with state["lock"]:
+            if version != state["seen_version"]:
+                _reload_scoring(state, version)
+
+    if state["table"] is None:
+        # nothing good to fall back to yet
+        raise RuntimeError(f"seasons.json is not usable: {state['error']}")
+    return state["table"]
+
+
+def _reload_scoring(state, version):
+    state["seen_version"] = version
+
+    # validate the new table before touching anything built from the old one
+    try:
+        table = scoring.load_scoring(SEASONS_FILE)
+    except (OSError, ValueError, KeyError, TypeError, OverflowError) as e:
+        state["error"] = f"{type(e).__name__}: {e}"
+        logger.error("Ignoring bad seasons.json, keeping the previous table: %s", state["error"])
+        return
+
+    state["table"] = table
+    state["table_version"] = version
+    state["error"] = None
+
+    # a new table invalidates every score and identification cached
+    # from the old one
+    st.cache_data.clear()
+    get_text_cache().clear()
+    get_photo_cache().clear()
+
+
+def scoring_version():
+    # version of the table actually in use
+    get_scoring()
+    return _scoring_state()["table_version"]
+
+
+def scoring_error():
+    return _scoring_state()["error"]
+
+
 # -----------------------------
-# Bird rarity + points (MVP)
+# Weekly totals
 # -----------------------------
+# Every sighting rescored against its season's table, summed per week.
+# Keyed by the table version, so editing seasons.json rescores history
+# once and the leaderboard and medals just read the totals.
+
+def weekly_totals():
+    if DEV_MODE:
+        return _weekly_totals_uncached(scoring_version())
+    return _weekly_totals_cached(scoring_version())
 
-BIRD_POINTS = {
 
-    # -----------------------------
-    # DECEMBER BIRD LIST
-    # -----------------------------
+def _weekly_totals_uncached(version):
+    data = load_data()
+    points = get_scoring().rescore(data)
 
-    # abundant tier
-    "House Sparrow": 5,
-    "Rock Pigeon": 5,
-    "American Robin": 5,
-    "European Starling": 5,
-    "Mourning Dove": 5,
-    "White-throated Sparrow": 5,
-    "Canada Goose": 5,
-    "Mallard": 5,
-    "Ring-billed Gull": 5,
-    "Herring Gull": 5,
-
-    # common tier
-    "Northern Cardinal": 10,
-    "Blue Jay": 10,
-    "Tufted Titmouse": 10,
-    "Red-tailed Hawk": 10,
-    "American Crow": 10,
-    "Song Sparrow": 10,
-    "House Finch": 10,
-    "Dark-eyed Junco": 10,
-    "Hermit Thrush": 10,
-    "Great Black-backed Gull": 10,
-    "Hooded Merganser": 10,
+    weekly = defaultdict(lambda: defaultdict(int))
+    for e, p in zip(data, points):
+        weekly[e["week"]][e["user"]] += p
 
-    # uncommon tier
-    "Carolina Wren": 15,
-    "Red-bellied Woodpecker": 15,
-    "Downy Woodpecker": 15,
-    "Cooper's Hawk": 15,
-    "White-breasted Nuthatch": 15,
-    "Yellow-bellied Sapsucker": 15,
-    "Gray Catbird": 15,
-    "Black-capped Chickadee": 15,
-    "Fox Sparrow": 15,
-    "Yellow-rumped Warbler": 15,
-  
-
-    # occasional tier
-    "American Goldfinch": 20,
-    "Ruby-crowned Kinglet": 20,
-    "Golden-crowned Kinglet": 20,
-    "Peregrine Falcon": 20,
-
-    # rare tier
-    "Great Horned Owl": 25,
-    "Nashville Warbler": 20,
+    return {week: dict(scores) for week, scores in weekly.items()}
 
-}
+
+@st.cache_data
+def _weekly_totals_cached(version):
+    return _weekly_totals_uncached(version)
+
+
+def current_birds():
+    return get_scoring().birds_at(datetime.now().isoformat())
 
 
 
@@ -202,6 +568,7 @@ TIER_COLORS = {
     "Uncommon": "#2E8B57",    # green
     "Occasional": "#1E90FF",  # blue
     "Rare": "#8A2BE2",        # purple
+    "Unlisted": "#808080",    # gray
 }
 
 
@@ -210,18 +577,6 @@ TIER_COLORS = {
 # -----------------------------
 
 
-# -----------------------------
-# Point tiers
-# -----------------------------
-
-TIER_BY_POINTS = {
-    5: "Abundant",
-    10: "Common",
-    15: "Uncommon",
-    20: "Occasional",
-    25: "Rare",
-}
-
 # -----------------------------
 # Lifetime medals
 # -----------------------------
@@ -232,13 +587,7 @@ def compute_lifetime_medals(user):
     return _compute_lifetime_medals_cached(user)
 
 def _compute_lifetime_medals_uncached(user):
-    data = load_data()
-
-    # group scores by week
-    weekly = defaultdict(lambda: defaultdict(int))
-
-    for e in data:
-        weekly[e["week"]][e["user"]] += e["points"]
+    weekly = weekly_totals()
 
     medals = {"🥇": 0, "🥈": 0, "🥉": 0}
 
@@ -276,21 +625,14 @@ def compute_lifetime_species(user):
 def _compute_lifetime_species_uncached(user):
     data = load_data()
 
-    species = {
-        "Abundant": set(),
-        "Common": set(),
-        "Uncommon": set(),
-        "Occasional": set(),
-        "Rare": set(),
-    }
+    table = get_scoring()
+    species = {tier: set() for tier in table.tier_names}
 
     for e in data:
         if e["user"].lower() != user.lower():
             continue
 
-        tier = TIER_BY_POINTS.get(e["points"])
-        if tier:
-            species[tier].add(e["bird"])
+        species[table.tier(e["bird"], e["timestamp"])].add(table.canonical_name(e["bird"]))
 
     return species
 
@@ -342,20 +684,24 @@ def confirm_bird(bird):
         )
         return
 
-    points = BIRD_POINTS.get(bird, 1)
+    timestamp = datetime.now().isoformat()
+    table = get_scoring()
+    points = table.points(bird, timestamp)
+    tier = table.tier(bird, timestamp)
 
     entry = {
         "user": username,
         "bird": bird,
         "points": points,
         "week": current_week(),
-        "timestamp": datetime.now().isoformat()
+        "timestamp": timestamp
     }
     save_entry(entry)
 
     st.session_state["confirmed"] = {
         "bird": bird,
-        "points": points
+        "points": points,
+        "tier": tier
     }
 
     st.session_state.pop("suggestions", None)
@@ -435,24 +781,25 @@ BIRD_DESCRIPTIONS = {
 
 
 def identify_bird(description):
-    if DEV_MODE:
-        return _identify_bird_uncached(description)
-    return _identify_bird_cached(description)
+    suggestions = _identify_bird_uncached(description)
+    if suggestions and not DEV_MODE:
+        get_text_cache().put(description, suggestions)
+    return suggestions
 
 
-def _identify_bird_uncached(description):
-    bird_list = list(BIRD_POINTS.keys())
+def cached_bird_result(description):
+    if DEV_MODE:
+        return None
+    return get_text_cache().get(description)
 
-    prompt = f"""
-You are an expert ornithologist specializing in birds found in Central Park, NYC.
 
-A user described a bird as:
-"{description}"
+def _ornithologist_prompt(subject):
+    bird_list = list(current_birds())
 
-# -----------------------------
-# Updated to draw from the list
-# -----------------------------
+    return f"""
+You are an expert ornithologist specializing in birds found in Central Park, NYC.
 
+{subject}
 
 You MUST choose ONLY from the following list of birds:
 {bird_list}
@@ -474,11 +821,13 @@ JSON format:
 ]
 """
 
+
+def _ask_ornithologist(user_content):
     response = client.chat.completions.create(
         model="gpt-4o-mini",
         messages=[
             {"role": "system", "content": "You strictly output JSON and only use provided bird names."},
-            {"role": "user", "content": prompt}
+            {"role": "user", "content": user_content}
         ],
         temperature=0.0
     )
@@ -490,7 +839,7 @@ JSON format:
     except json.JSONDecodeError:
         return None
 
-    allowed_birds = set(BIRD_POINTS.keys())
+    allowed_birds = set(current_birds())
 
 # Filter out any birds not in our official list
     suggestions = [
@@ -498,6 +847,25 @@ JSON format:
         if s.get("bird") in allowed_birds
 ]
 
+    return suggestions or None
+
+
+def _normalize_confidences(suggestions):
+    total = sum(s["confidence"] for s in suggestions if s["confidence"] > 0)
+    if total > 0:
+        for s in suggestions:
+            s["confidence"] /= total
+
+    return suggestions
+
+
+def _identify_bird_uncached(description):
+    prompt = _ornithologist_prompt(
+        f'A user described a bird as:\n"{description}"'
+    )
+
+    suggestions = _ask_ornithologist(prompt)
+
     if not suggestions:
         return None
 
@@ -520,16 +888,137 @@ JSON format:
 
 
     # Normalize confidences
-    total = sum(s["confidence"] for s in suggestions if s["confidence"] > 0)
-    if total > 0:
-        for s in suggestions:
-            s["confidence"] /= total
+    return _normalize_confidences(suggestions)
+
+TEXT_CACHE_SIZE = 512
+
 
+@st.cache_resource
+def get_text_cache():
+    # description -> suggestions; checked before admission so a repeat
+    # description costs no tokens
+    return ResultCache(TEXT_CACHE_SIZE)
+
+# -----------------------------
+# Photo identification
+# -----------------------------
+# Downscaling, hashing and the near-duplicate cache live in photos.py.
+
+@st.cache_resource
+def get_photo_cache():
+    return PhotoResultCache()
+
+
+def cached_photo_result(phash):
+    if DEV_MODE:
+        return None
+    return get_photo_cache().get(phash)
+
+
+def identify_photo(jpeg_bytes, phash):
+    suggestions = _identify_photo_uncached(jpeg_bytes)
+    if suggestions and not DEV_MODE:
+        get_photo_cache().put(phash, suggestions)
     return suggestions
 
-@st.cache_data(show_spinner=False)
-def _identify_bird_cached(description):
-    return _identify_bird_uncached(description)
+
+def _identify_photo_uncached(jpeg_bytes):
+    encoded = base64.b64encode(jpeg_bytes).decode()
+
+    prompt = _ornithologist_prompt(
+        "A user uploaded the attached photo of a bird."
+    )
+
+    suggestions = _ask_ornithologist([
+        {"type": "text", "text": prompt},
+        {
+            "type": "image_url",
+            "image_url": {"url": f"data:image/jpeg;base64,{encoded}", "detail": "low"}
+        },
+    ])
+
+    if not suggestions:
+        return None
+
+    return _normalize_confidences(suggestions)
+
+# -----------------------------
+# Admission control (rate limits + queue)
+# -----------------------------
+
+# per browser session: a burst of 5, then one identify every 12 seconds
+USER_RATE = 1 / 12
+USER_BURST = 5
+
+# shared across everyone, keeps us under the API rate limit
+GLOBAL_RATE = 1.0
+GLOBAL_BURST = 10
+
+MAX_QUEUE = 20
+MAX_QUEUE_WAIT = 30  # seconds before we give up waiting in line
+
+
+@st.cache_resource
+def get_admission_controller():
+    # one controller shared by every session on this server
+    return AdmissionController(
+        user_rate=USER_RATE,
+        user_burst=USER_BURST,
+        global_rate=GLOBAL_RATE,
+        global_burst=GLOBAL_BURST,
+        max_queue=MAX_QUEUE,
+    )
+
+
+def admission_key():
+    # the browser session, not the Username box, which anyone can retype
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx else "local"
+
+
+def identify_bird_admitted(description):
+    suggestions = cached_bird_result(description)
+    if suggestions is not None:
+        return suggestions
+    return run_admitted(identify_bird, description)
+
+
+def run_admitted(identify, *args):
+    controller = get_admission_controller()
+    ticket = controller.enqueue(admission_key())
+
+    if isinstance(ticket, Rejected):
+        return ticket
+
+    status = st.empty()
+    deadline = time.monotonic() + MAX_QUEUE_WAIT
+
+    try:
+        while True:
+            position = controller.poll(ticket)
+            if position == 0:
+                break
+            if position is None or time.monotonic() > deadline:
+                controller.cancel(ticket)
+                return Rejected("timeout", controller.estimated_wait())
+
+            status.info(f"⏳ Lots of birders right now — you're #{position} in line.")
+            time.sleep(0.5)
+    finally:
+        controller.cancel(ticket)
+        status.empty()
+
+    return identify(*args)
+
+
+def rejection_message(rejected):
+    wait = max(1, int(rejected.retry_after + 0.999))
+
+    if rejected.reason == "user_limit":
+        return f"🐢 Slow down! You can identify another bird in {wait}s."
+    if rejected.reason == "already_queued":
+        return "⏳ You already have an identification in progress."
+    return f"🚦 Bird Hunt is busy right now. Please try again in {wait}s."
 
 
 
@@ -558,14 +1047,51 @@ def save_entry(entry):
     with open(DATA_FILE, "w") as f:
         json.dump(data, f, indent=2)
 
+    # fold the sighting into the rollups, or rebuild them if they're
+    # missing or have drifted from the history
+    canonical = get_scoring().canonical_name
+    r = rollups.load_rollups(ROLLUP_FILE)
+    if r is None or r["entries"] != len(data) - 1:
+        r = rollups.rebuild(data, canonical)
+    else:
+        rollups.apply_entry(r, entry, canonical)
+    rollups.save_rollups(ROLLUP_FILE, r)
+
 # 🔥 invalidate cached data
     st.cache_data.clear()
 
 
 
+def load_rollups():
+    if DEV_MODE:
+        return _load_rollups_uncached()
+    return _load_rollups_cached()
+
+
+def _load_rollups_uncached():
+    r = rollups.load_rollups(ROLLUP_FILE)
+    if r is None:
+        # first run (or old format): build once from history
+        r = rollups.rebuild(_load_data_uncached(), get_scoring().canonical_name)
+        rollups.save_rollups(ROLLUP_FILE, r)
+    return r
+
+
+@st.cache_data
+def _load_rollups_cached():
+    return _load_rollups_uncached()
+
+
+
 def current_week():
     return datetime.now().isocalendar().week
 
+# compile (or pick up an edited table) before any cached score is read
+get_scoring()
+
+if scoring_error():
+    st.error(f"⚠️ seasons.json has a problem, still scoring with the previous table. {scoring_error()}")
+
 # -----------------------------
 # Username
 # -----------------------------
@@ -573,11 +1099,16 @@ raw_username = st.text_input("Username")
 username = raw_username.strip().lower()
 
 if not username:
+    # st.stop() skips the bottom of the script, so release the profiler here
+    stop_profile_run()
     st.stop()
 
 if "selected_user" not in st.session_state:
     st.session_state["selected_user"] = None
 
+if is_admin():
+    profiling_sidebar()
+
 
 # -----------------------------
 # Main menu
@@ -587,13 +1118,21 @@ if "_navigate_to" in st.session_state:
     st.session_state["choice"] = st.session_state.pop("_navigate_to")
 
 choice = st.radio(
-    "Choose an option", ["📝 Submit Bird", "🏆 Leaderboard", "📚 Lifetime Stats", "🖼️ Full Species List"],
+    "Choose an option", PAGES,
     key="choice")
 
-# =============================
-# SUBMIT BIRD
-# =============================
-if choice == "📝 Submit Bird":
+# -----------------------------
+# Pages
+# -----------------------------
+# Each page is a fragment: clicks inside it rerun just that page,
+# not the background, CSS and the rest of the script.
+
+LEADERBOARD_REFRESH_SECONDS = 30
+
+
+@st.fragment
+@profiled
+def submit_bird_page():
     st.subheader("Submit a Bird")
     count = species_collected_this_week(username)
     st.metric(
@@ -612,11 +1151,11 @@ if choice == "📝 Submit Bird":
 
 
     # 🎉 Rarity reactions
-            if c["points"] == 20:
+            if c["tier"] == "Occasional":
                 st.info("🎉 Congrats! This species is hard to find right now.")
                 st.balloons()
 
-            elif c["points"] == 25:
+            elif c["tier"] == "Rare":
                 st.info("🔥 Wow! This is a rare sighting.")
                 st.balloons()
 
@@ -624,26 +1163,68 @@ if choice == "📝 Submit Bird":
             del st.session_state["confirmed"]
 
 
-    description = st.text_area(
-        "Describe the bird you saw",
-        placeholder="Size, color, behavior, location in Central Park..."
-    )
+    describe_tab, photo_tab = st.tabs(["✍️ Describe it", "📷 Upload a photo"])
 
-    if st.button("🔍 Identify bird"):
-        if not description:
-            st.warning("Please describe the bird first.")
+    with describe_tab:
+        description = st.text_area(
+            "Describe the bird you saw",
+            placeholder="Size, color, behavior, location in Central Park..."
+        )
+
+        if st.button("🔍 Identify bird"):
+            if not description:
+                st.warning("Please describe the bird first.")
+            else:
+                with st.spinner("Identifying bird..."):
+                    suggestions = identify_bird_admitted(description)
+
+                if isinstance(suggestions, Rejected):
+                    st.warning(rejection_message(suggestions))
+                else:
+                    st.session_state["suggestions"] = suggestions
+
+    with photo_tab:
+        photo = st.file_uploader(
+            "Upload a photo of the bird",
+            type=["jpg", "jpeg", "png", "webp"]
+        )
+
+        if st.button("🔍 Identify from photo"):
+            if photo is None:
+                st.warning("Please upload a photo first.")
+            else:
+                with st.spinner("Identifying bird..."):
+                    try:
+                        jpeg_bytes, phash = prepare_photo(photo.getvalue())
+                    except (OSError, Image.DecompressionBombError):
+                        jpeg_bytes = None
+                        suggestions = None
+                        st.warning("Sorry, we couldn't read that photo. Try a JPEG or PNG.")
+
+                    if jpeg_bytes is not None:
+                        suggestions = cached_photo_result(phash)
+                        if suggestions is None:
+                            suggestions = run_admitted(identify_photo, jpeg_bytes, phash)
+
+                if isinstance(suggestions, Rejected):
+                    st.warning(rejection_message(suggestions))
+                elif jpeg_bytes is not None:
+                    st.session_state["suggestions"] = suggestions
+
+    if "suggestions" in st.session_state:
+        if st.session_state["suggestions"]:
+            suggestion_cards(st.session_state["suggestions"])
         else:
-            with st.spinner("Identifying bird..."):
-                suggestions = identify_bird(description)
-                st.session_state["suggestions"] = suggestions
+            st.warning("We couldn't match that to a bird on our list. Try again with more detail.")
 
-if choice == "📝 Submit Bird" and "suggestions" in st.session_state:
+
+def suggestion_cards(suggestions):
     st.markdown("### Likely birds")
     st.caption(
         "Not seeing the right bird? Try adding size, behavior, or movement details. Click on the images to expand them for a better view."
     )
 
-    for s in st.session_state["suggestions"]:
+    for s in suggestions:
         bird = s["bird"]
         confidence = int(s["confidence"] * 100)
 
@@ -671,23 +1252,16 @@ if choice == "📝 Submit Bird" and "suggestions" in st.session_state:
 
         st.divider()
 
-# =============================
-# LEADERBOARD
-# =============================
-if choice == "🏆 Leaderboard":
-    st.subheader("🏆 Leaderboard")
-
 
+# refreshes itself so the standings stay live without a full rerun
+@st.fragment(run_every=LEADERBOARD_REFRESH_SECONDS)
+@profiled
+def leaderboard_page():
+    st.subheader("🏆 Leaderboard")
 
-    data = load_data()
 
-    weekly_scores = defaultdict(int)
-    lifetime_scores = defaultdict(int)
 
-    for entry in data:
-        lifetime_scores[entry["user"]] += entry["points"]
-        if entry["week"] == current_week():
-            weekly_scores[entry["user"]] += entry["points"]
+    weekly_scores = weekly_totals().get(current_week(), {})
 
     st.markdown("### This Week")
     if weekly_scores:
@@ -708,17 +1282,15 @@ if choice == "🏆 Leaderboard":
             ):
                 st.session_state["selected_user"] = user
                 st.session_state["_navigate_to"] = "📚 Lifetime Stats"
-                st.rerun()
+                # switching pages needs the whole app, not just this fragment
+                st.rerun(scope="app")
     else:
         st.write("No submissions yet this week.")
 
-# =============================
-# LIFETIME STATS
-# =============================
-
-view_user = st.session_state.get("selected_user") or username
 
-if choice == "📚 Lifetime Stats":
+@st.fragment
+@profiled
+def lifetime_stats_page():
     view_user = st.session_state.get("selected_user") or username
 
     st.subheader(f"📚 Lifetime Stats — {view_user}")
@@ -759,13 +1331,80 @@ if choice == "📚 Lifetime Stats":
     if st.session_state.get("selected_user"):
         if st.button("← Back to my stats"):
             st.session_state["selected_user"] = None
+            st.rerun(scope="fragment")
+
+
+TREND_WEEKS = 12
+TREND_WINDOW = 4  # weeks compared for "getting rarer"
 
 
-# =============================
-# FULL SPECIES LIST
-# =============================
+@st.fragment
+@profiled
+def trends_page():
+    st.subheader("📈 Trends")
+
+    # everything here reads the rollups, never the raw history
+    r = load_rollups()
+    weeks = rollups.recent_weeks(TREND_WEEKS)
+    species_weeks = r["species_weeks"]
+
+    if not species_weeks:
+        st.write("No sightings yet.")
+        return
+
+    st.markdown(f"### Sightings per week (last {TREND_WEEKS} weeks)")
 
-if choice == "🖼️ Full Species List":
+    picked = st.multiselect(
+        "Species",
+        sorted(species_weeks),
+        default=sorted(
+            species_weeks,
+            key=lambda b: sum(species_weeks[b].get(w, 0) for w in weeks),
+            reverse=True
+        )[:5]
+    )
+
+    if picked:
+        chart = {"week": weeks}
+        for bird in picked:
+            chart[bird] = [species_weeks[bird].get(w, 0) for w in weeks]
+        st.line_chart(chart, x="week", y=picked)
+
+    st.markdown("### 📉 Getting rarer")
+    st.caption(
+        f"Sightings in the last {TREND_WINDOW} weeks compared to the {TREND_WINDOW} weeks before."
+    )
+
+    before_weeks = weeks[-2 * TREND_WINDOW:-TREND_WINDOW]
+    recent = weeks[-TREND_WINDOW:]
+
+    declining = []
+    for bird, counts in species_weeks.items():
+        before = sum(counts.get(w, 0) for w in before_weeks)
+        now = sum(counts.get(w, 0) for w in recent)
+        if before > now:
+            declining.append((bird, before, now))
+
+    if declining:
+        table = get_scoring()
+        now_ts = datetime.now().isoformat()
+        declining.sort(key=lambda x: (x[2] - x[1], x[0]))
+        for bird, before, now in declining:
+            tier = table.tier(bird, now_ts)
+            st.write(f"• **{bird}** ({tier}) — {before} → {now}")
+    else:
+        st.write("Nothing is getting rarer right now.")
+
+    st.markdown("### 👀 Distinct spotters")
+    spotters = sorted(
+        ((bird, len(users)) for bird, users in r["spotters"].items()),
+        key=lambda x: (-x[1], x[0])
+    )
+    for bird, n in spotters:
+        st.write(f"• {bird} — {n} {'birder' if n == 1 else 'birders'}")
+
+
+def full_species_list_page():
     st.subheader("🖼️ Full Species List")
 
     query = st.text_input(
@@ -790,4 +1429,44 @@ if choice == "🖼️ Full Species List":
                         bird,
                         "No description available yet."
                     )
-                )
\ No newline at end of file
+                )
+
+
+# Pages run inside try/finally so the profiler (and its server-wide
+# cProfile slot) is released even if a page raises, stops or reruns.
+try:
+    # =============================
+    # SUBMIT BIRD
+    # =============================
+    if choice == "📝 Submit Bird":
+        submit_bird_page()
+
+    # =============================
+    # LEADERBOARD
+    # =============================
+    if choice == "🏆 Leaderboard":
+        leaderboard_page()
+
+    # =============================
+    # LIFETIME STATS
+    # =============================
+    if choice == "📚 Lifetime Stats":
+        lifetime_stats_page()
+
+    # =============================
+    # TRENDS
+    # =============================
+    if choice == "📈 Trends":
+        trends_page()
+
+    # =============================
+    # FULL SPECIES LIST
+    # =============================
+    if choice == "🖼️ Full Species List":
+        full_species_list_page()
+finally:
+    capture_done = stop_profile_run()
+
+if capture_done:
+    # the sidebar was drawn before the capture finished
+    st.rerun()
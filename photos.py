@@ -0,0 +1,69 @@
+import io
+
+from PIL import Image, ImageOps
+
+from result_cache import ResultCache
+
+# -----------------------------
+# Photo identification helpers
+# -----------------------------
+# Phone photos are shrunk locally before upload, and results are cached
+# by perceptual hash so a near-identical photo never hits the model.
+
+PHOTO_MAX_SIDE = 768
+PHOTO_JPEG_QUALITY = 85
+
+PHOTO_CACHE_SIZE = 256
+PHOTO_HASH_MAX_DISTANCE = 6  # differing bits out of 64
+
+
+def prepare_photo(data):
+    # returns (jpeg_bytes, perceptual_hash) with EXIF stripped
+    with Image.open(io.BytesIO(data)) as img:
+        # let the JPEG decoder skip detail we're about to throw away
+        img.draft("RGB", (PHOTO_MAX_SIDE, PHOTO_MAX_SIDE))
+
+        # bake in the phone's rotation before the EXIF is dropped
+        img = ImageOps.exif_transpose(img)
+        img = img.convert("RGB")
+        img.thumbnail((PHOTO_MAX_SIDE, PHOTO_MAX_SIDE))
+
+        out = io.BytesIO()
+        img.save(out, format="JPEG", quality=PHOTO_JPEG_QUALITY, optimize=True)
+
+        return out.getvalue(), photo_hash(img)
+
+
+def photo_hash(img):
+    # 64-bit difference hash: compares neighbouring pixels of a 9x8 thumbnail
+    small = img.convert("L").resize((9, 8), Image.Resampling.LANCZOS)
+    pixels = small.tobytes()  # mode "L": one byte per pixel
+
+    value = 0
+    for row in range(8):
+        for col in range(8):
+            left = pixels[row * 9 + col]
+            right = pixels[row * 9 + col + 1]
+            value = (value << 1) | (left > right)
+
+    return value
+
+
+def hash_distance(a, b):
+    return bin(a ^ b).count("1")
+
+
+class PhotoResultCache(ResultCache):
+    # a lookup hits the closest stored hash within max_distance bits
+
+    def __init__(self, max_size=PHOTO_CACHE_SIZE, max_distance=PHOTO_HASH_MAX_DISTANCE):
+        super().__init__(max_size)
+        self.max_distance = max_distance
+
+    def _find(self, phash):
+        best = None
+        for key in self._entries:
+            distance = hash_distance(key, phash)
+            if distance <= self.max_distance and (best is None or distance < best[0]):
+                best = (distance, key)
+        return best[1] if best else None
@@ -0,0 +1,44 @@
+import threading
+from collections import OrderedDict
+
+# -----------------------------
+# Identification result caches
+# -----------------------------
+# Shared by every session (the app holds them in st.cache_resource), so
+# they lock, and hand out copies so callers can't mutate what's cached.
+
+
+class ResultCache:
+    # LRU of key -> list of suggestion dicts
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _find(self, key):
+        # the stored key that answers for `key`, or None
+        return key if key in self._entries else None
+
+    def get(self, key):
+        with self._lock:
+            found = self._find(key)
+            if found is None:
+                return None
+            self._entries.move_to_end(found)
+            return [dict(s) for s in self._entries[found]]
+
+    def put(self, key, suggestions):
+        with self._lock:
+            self._entries[key] = [dict(s) for s in suggestions]
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
@@ -0,0 +1,109 @@
+import argparse
+import json
+import os
+from datetime import datetime, timedelta
+
+import scoring
+
+# -----------------------------
+# Sighting rollups
+# -----------------------------
+# Small summary tables kept next to submissions.json so the trends page
+# never has to scan the full history:
+#
+#   species_weeks: {bird: {"2025-W51": sightings}}
+#   spotters:      {bird: [users who have ever reported it]}
+#
+# Birds are keyed by their canonical name from the season tables, so
+# "Great Black-Backed Gull" and "Great Black-backed Gull" are one species.
+#
+# save_entry() folds each new sighting in with apply_entry(), and rebuilds
+# when the entry count no longer matches the history. To rebuild offline:
+#
+#   python rollups.py --data submissions.json --out rollups.json
+
+ROLLUP_VERSION = 2
+
+
+def empty_rollups():
+    return {
+        "version": ROLLUP_VERSION,
+        "entries": 0,
+        "species_weeks": {},
+        "spotters": {},
+    }
+
+
+def year_week(when):
+    # ISO year-week label, e.g. "2025-W51"
+    if isinstance(when, str):
+        when = datetime.fromisoformat(when)
+    iso = when.isocalendar()
+    return f"{iso.year}-W{iso.week:02d}"
+
+
+def recent_weeks(n, today=None):
+    # the last n year-week labels, oldest first, ending with this week
+    today = today or datetime.now()
+    return [year_week(today - timedelta(weeks=i)) for i in reversed(range(n))]
+
+
+def apply_entry(rollups, entry, canonical=None):
+    bird = canonical(entry["bird"]) if canonical else entry["bird"]
+    user = entry["user"].lower()
+    week = year_week(entry["timestamp"])
+
+    weeks = rollups["species_weeks"].setdefault(bird, {})
+    weeks[week] = weeks.get(week, 0) + 1
+
+    spotters = rollups["spotters"].setdefault(bird, [])
+    if user not in spotters:
+        spotters.append(user)
+
+    rollups["entries"] += 1
+    return rollups
+
+
+def rebuild(entries, canonical=None):
+    rollups = empty_rollups()
+    for entry in entries:
+        apply_entry(rollups, entry, canonical)
+    return rollups
+
+
+def load_rollups(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, "r") as f:
+        rollups = json.load(f)
+    if rollups.get("version") != ROLLUP_VERSION:
+        return None
+    return rollups
+
+
+def save_rollups(path, rollups):
+    # write then swap, so a reader never sees half a file
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(rollups, f, indent=2)
+    os.replace(tmp, path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild Bird Hunt rollups from history.")
+    parser.add_argument("--data", default="submissions.json")
+    parser.add_argument("--out", default="rollups.json")
+    parser.add_argument("--seasons", default="seasons.json")
+    args = parser.parse_args()
+
+    with open(args.data, "r") as f:
+        entries = json.load(f)
+
+    table = scoring.load_scoring(args.seasons)
+    rollups = rebuild(entries, table.canonical_name)
+    save_rollups(args.out, rollups)
+    print(f"Rebuilt {args.out} from {rollups['entries']} sightings.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+import json
+from array import array
+from bisect import bisect_right
+
+# -----------------------------
+# Seasonal point tiers
+# -----------------------------
+# seasons.json lists, for each season, which birds sit in which tier.
+# Every sighting is scored against the season active at its timestamp.
+#
+# On load each season is compiled into two arrays indexed by species id
+# (points and tier), so scoring a sighting is a bisect on the season
+# start plus two array reads. Rescoring history after a table edit is
+# just scoring every entry again.
+
+
+class SeasonTable:
+    def __init__(self, season_id, starts, points, tiers, birds):
+        self.id = season_id
+        self.starts = starts
+        self.points = points  # array, by species id
+        self.tiers = tiers    # array of tier ids, by species id
+        self.birds = birds    # birds listed this season, in table order
+
+
+class Scoring:
+    def __init__(self, config):
+        tiers = config["tiers"]
+        unlisted = config["unlisted"]
+
+        # the last tier id is reserved for birds missing from a season
+        self.tier_names = [t["name"] for t in tiers] + [unlisted["name"]]
+        self.unlisted_tier = len(tiers)
+        self.unlisted_points = unlisted["points"]
+
+        tier_ids = {t["name"]: i for i, t in enumerate(tiers)}
+        tier_points = [t["points"] for t in tiers]
+
+        seasons = sorted(config["seasons"], key=lambda s: s["starts"])
+        if not seasons:
+            raise ValueError("seasons.json needs at least one season")
+
+        # species ids are shared by every season; names match case-insensitively
+        # so older entries like "Great Black-Backed Gull" still score
+        self.species = []
+        self.species_ids = {}
+        for season in seasons:
+            for birds in season["tiers"].values():
+                for bird in birds:
+                    if bird.lower() not in self.species_ids:
+                        self.species_ids[bird.lower()] = len(self.species)
+                        self.species.append(bird)
+
+        n = len(self.species)
+        self.seasons = []
+        for season in seasons:
+            points = array("H", [self.unlisted_points] * n)
+            tiers_arr = array("B", [self.unlisted_tier] * n)
+            birds = []
+            seen = set()
+
+            for tier_name, tier_birds in season["tiers"].items():
+                if tier_name not in tier_ids:
+                    raise ValueError(
+                        f"Unknown tier {tier_name!r} in season {season['id']!r}"
+                    )
+                tier = tier_ids[tier_name]
+                for bird in tier_birds:
+                    sid = self.species_ids[bird.lower()]
+                    if sid in seen:
+                        raise ValueError(
+                            f"{bird!r} is listed twice in season {season['id']!r}"
+                        )
+                    seen.add(sid)
+                    points[sid] = tier_points[tier]
+                    tiers_arr[sid] = tier
+                    birds.append(bird)
+
+            self.seasons.append(
+                SeasonTable(season["id"], season["starts"], points, tiers_arr, birds)
+            )
+
+        # ISO strings sort like the dates they hold, so bisect on them directly
+        self._starts = [s.starts for s in self.seasons]
+
+    def season_at(self, timestamp):
+        # the season active at an ISO timestamp; the first season also
+        # covers anything logged before it started
+        i = bisect_right(self._starts, timestamp) - 1
+        return self.seasons[max(i, 0)]
+
+    def points(self, bird, timestamp):
+        sid = self.species_ids.get(bird.lower())
+        if sid is None:
+            return self.unlisted_points
+        return self.season_at(timestamp).points[sid]
+
+    def tier(self, bird, timestamp):
+        sid = self.species_ids.get(bird.lower())
+        if sid is None:
+            return self.tier_names[self.unlisted_tier]
+        return self.tier_names[self.season_at(timestamp).tiers[sid]]
+
+    def canonical_name(self, bird):
+        # the spelling used in the tables; unlisted birds are left as is
+        sid = self.species_ids.get(bird.lower())
+        if sid is None:
+            return bird
+        return self.species[sid]
+
+    def birds_at(self, timestamp):
+        return self.season_at(timestamp).birds
+
+    def rescore(self, entries):
+        # points for each entry under the current tables
+        return [self.points(e["bird"], e["timestamp"]) for e in entries]
+
+
+def load_scoring(path):
+    with open(path, "r") as f:
+        return Scoring(json.load(f))
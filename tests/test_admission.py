@@ -0,0 +1,143 @@
+import pytest
+
+from admission import AdmissionController, Rejected, Ticket, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def make_controller(clock, **overrides):
+    settings = dict(
+        user_rate=1 / 12,
+        user_burst=2,
+        global_rate=1.0,
+        global_burst=1,
+        max_queue=3,
+        clock=clock,
+    )
+    settings.update(overrides)
+    return AdmissionController(**settings)
+
+
+def test_bucket_burst_then_refill(clock):
+    bucket = TokenBucket(rate=0.5, capacity=2, clock=clock)
+
+    assert bucket.try_take()
+    assert bucket.try_take()
+    assert not bucket.try_take()
+    assert bucket.retry_after() == pytest.approx(2.0)
+
+    clock.advance(2)
+    assert bucket.try_take()
+    assert not bucket.try_take()
+
+
+def test_bucket_never_exceeds_capacity(clock):
+    bucket = TokenBucket(rate=1.0, capacity=2, clock=clock)
+    clock.advance(100)
+
+    assert bucket.try_take()
+    assert bucket.try_take()
+    assert not bucket.try_take()
+
+
+def test_user_limit_reports_retry_after(clock):
+    controller = make_controller(clock, global_burst=10)
+
+    for _ in range(2):
+        ticket = controller.enqueue("aydin")
+        assert controller.poll(ticket) == 0
+
+    rejected = controller.enqueue("aydin")
+    assert isinstance(rejected, Rejected)
+    assert rejected.reason == "user_limit"
+    assert rejected.retry_after == pytest.approx(12.0)
+
+    clock.advance(12)
+    assert isinstance(controller.enqueue("aydin"), Ticket)
+
+
+def test_one_queue_spot_per_user(clock):
+    controller = make_controller(clock)
+    first = controller.enqueue("aydin")
+    assert isinstance(first, Ticket)
+
+    second = controller.enqueue("aydin")
+    assert isinstance(second, Rejected)
+    assert second.reason == "already_queued"
+    assert controller.queue_length() == 1
+
+
+def test_queue_overflow_is_rejected(clock):
+    controller = make_controller(clock)
+    for user in ["a", "b", "c"]:
+        assert isinstance(controller.enqueue(user), Ticket)
+
+    rejected = controller.enqueue("d")
+    assert isinstance(rejected, Rejected)
+    assert rejected.reason == "overloaded"
+    assert rejected.retry_after > 0
+
+
+def test_admits_in_fifo_order(clock):
+    controller = make_controller(clock)
+    a, b, c = (controller.enqueue(u) for u in ["a", "b", "c"])
+
+    # only the head can go, and only when a global token is free
+    assert controller.poll(b) == 2
+    assert controller.poll(a) == 0
+    assert controller.poll(b) == 1
+    assert controller.poll(c) == 2
+
+    clock.advance(1)
+    assert controller.poll(c) == 2
+    assert controller.poll(b) == 0
+
+    clock.advance(1)
+    assert controller.poll(c) == 0
+    assert controller.queue_length() == 0
+
+
+def test_cancel_frees_the_spot(clock):
+    controller = make_controller(clock)
+    a = controller.enqueue("a")
+    b = controller.enqueue("b")
+
+    controller.cancel(a)
+    assert controller.poll(a) is None
+    assert controller.poll(b) == 0
+
+
+def test_estimated_wait_grows_with_queue(clock):
+    controller = make_controller(clock, global_burst=0.0001)
+    empty = controller.estimated_wait()
+
+    controller.enqueue("a")
+    controller.enqueue("b")
+    assert controller.estimated_wait() == pytest.approx(empty + 2.0)
+
+
+def test_idle_user_buckets_are_dropped(clock):
+    controller = make_controller(clock, global_burst=10)
+    for user in ["a", "b", "c"]:
+        controller.poll(controller.enqueue(user))
+    assert len(controller._users) == 3
+
+    # 2 tokens at 1/12 per second: full again after 24s
+    clock.advance(24)
+    controller.poll(controller.enqueue("d"))
+    assert set(controller._users) == {"d"}
+
@@ -0,0 +1,101 @@
+import io
+
+import pytest
+from PIL import Image, ImageDraw, ImageEnhance
+
+from photos import (
+    PHOTO_HASH_MAX_DISTANCE,
+    PHOTO_MAX_SIDE,
+    PhotoResultCache,
+    hash_distance,
+    photo_hash,
+    prepare_photo,
+)
+from result_cache import ResultCache
+
+BLUE_JAY = [{"bird": "Blue Jay", "confidence": 1.0}]
+ROBIN = [{"bird": "American Robin", "confidence": 1.0}]
+
+
+def make_image(size=(400, 300), seed=0):
+    # something with structure, so the hash has edges to work with
+    img = Image.new("RGB", size, "white")
+    draw = ImageDraw.Draw(img)
+    w, h = size
+    for i in range(6):
+        x = (i * 97 + seed * 53) % w
+        y = (i * 61 + seed * 31) % h
+        draw.ellipse([x, y, x + w // 4, y + h // 4], fill=(40 * i, 255 - 30 * i, 90 + seed * 20))
+    return img
+
+
+def encode(img, **save_args):
+    out = io.BytesIO()
+    img.save(out, format="JPEG", **save_args)
+    return out.getvalue()
+
+
+def test_prepare_photo_applies_exif_rotation_and_strips_exif():
+    exif = Image.Exif()
+    exif[0x0112] = 6  # orientation: rotate 90 degrees clockwise
+    exif[0x010F] = "PhoneMaker"
+    data = encode(make_image((400, 200)), exif=exif.tobytes())
+
+    jpeg, _ = prepare_photo(data)
+    out = Image.open(io.BytesIO(jpeg))
+
+    assert out.size == (200, 400)
+    assert not out.getexif()
+    assert "exif" not in out.info
+
+
+def test_prepare_photo_downscales_and_reencodes():
+    data = encode(make_image((3000, 2000)), quality=95)
+
+    jpeg, _ = prepare_photo(data)
+    out = Image.open(io.BytesIO(jpeg))
+
+    assert out.format == "JPEG"
+    assert max(out.size) == PHOTO_MAX_SIDE
+    assert out.size[0] / out.size[1] == pytest.approx(1.5, rel=0.01)
+    assert len(jpeg) < len(data)
+
+
+def test_near_duplicate_photos_share_a_hash_neighbourhood():
+    img = make_image()
+    tweaked = ImageEnhance.Brightness(img).enhance(1.1).resize((200, 150))
+    other = make_image(seed=3)
+
+    assert hash_distance(photo_hash(img), photo_hash(tweaked)) <= PHOTO_HASH_MAX_DISTANCE
+    assert hash_distance(photo_hash(img), photo_hash(other)) > PHOTO_HASH_MAX_DISTANCE
+
+
+def test_photo_cache_hits_nearest_hash_within_distance():
+    cache = PhotoResultCache(max_distance=2)
+    cache.put(0b0000, BLUE_JAY)
+    cache.put(0b1111, ROBIN)
+
+    assert cache.get(0b0001) == BLUE_JAY
+    assert cache.get(0b0111) == ROBIN
+    assert cache.get(0b1111 << 8) is None
+
+
+def test_cache_evicts_least_recently_used():
+    cache = ResultCache(max_size=2)
+    cache.put("blue", BLUE_JAY)
+    cache.put("red", ROBIN)
+
+    cache.get("blue")  # now most recent
+    cache.put("grey", ROBIN)
+
+    assert cache.get("red") is None
+    assert cache.get("blue") == BLUE_JAY
+    assert len(cache) == 2
+
+
+def test_cache_hands_out_copies():
+    cache = ResultCache(max_size=2)
+    cache.put("blue", BLUE_JAY)
+
+    cache.get("blue")[0]["confidence"] = 0.0
+    assert cache.get("blue") == BLUE_JAY
@@ -0,0 +1,32 @@
+import os
+
+import rollups
+import scoring
+
+SEASONS_FILE = os.path.join(os.path.dirname(__file__), "..", "seasons.json")
+
+
+def entry(bird, user="aydin", timestamp="2025-12-15T10:00:00"):
+    return {"user": user, "bird": bird, "points": 10, "week": 51, "timestamp": timestamp}
+
+
+def test_apply_entry_counts_by_week_and_spotter():
+    r = rollups.empty_rollups()
+    rollups.apply_entry(r, entry("Blue Jay"))
+    rollups.apply_entry(r, entry("Blue Jay", user="Test 2"))
+    rollups.apply_entry(r, entry("Blue Jay", timestamp="2025-12-22T10:00:00"))
+
+    assert r["species_weeks"]["Blue Jay"] == {"2025-W51": 2, "2025-W52": 1}
+    assert r["spotters"]["Blue Jay"] == ["aydin", "test 2"]
+    assert r["entries"] == 3
+
+
+def test_canonical_names_merge_spellings():
+    table = scoring.load_scoring(SEASONS_FILE)
+    r = rollups.rebuild(
+        [entry("Great Black-Backed Gull"), entry("Great Black-backed Gull")],
+        table.canonical_name
+    )
+
+    assert list(r["species_weeks"]) == ["Great Black-backed Gull"]
+    assert r["species_weeks"]["Great Black-backed Gull"]["2025-W51"] == 2
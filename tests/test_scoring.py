@@ -0,0 +1,87 @@
+import pytest
+
+from scoring import Scoring
+
+CONFIG = {
+    "tiers": [
+        {"name": "Common", "points": 10},
+        {"name": "Rare", "points": 25},
+    ],
+    "unlisted": {"name": "Unlisted", "points": 1},
+    "seasons": [
+        {
+            "id": "winter",
+            "starts": "2025-12-01",
+            "tiers": {"Common": ["Blue Jay"], "Rare": ["Nashville Warbler"]},
+        },
+        {
+            "id": "spring",
+            "starts": "2026-03-01",
+            "tiers": {"Common": ["Blue Jay", "Nashville Warbler"]},
+        },
+    ],
+}
+
+
+def test_scores_against_season_at_timestamp():
+    table = Scoring(CONFIG)
+
+    assert table.points("Nashville Warbler", "2025-12-20T09:00:00") == 25
+    assert table.tier("Nashville Warbler", "2025-12-20T09:00:00") == "Rare"
+    assert table.points("Nashville Warbler", "2026-03-02T09:00:00") == 10
+
+    # before the first season falls back to it
+    assert table.points("Nashville Warbler", "2025-01-01T09:00:00") == 25
+
+
+def test_unlisted_birds_are_explicit():
+    table = Scoring(CONFIG)
+
+    assert table.points("Eastern Phoebe", "2025-12-20T09:00:00") == 1
+    assert table.tier("Eastern Phoebe", "2025-12-20T09:00:00") == "Unlisted"
+
+
+def test_names_match_case_insensitively():
+    table = Scoring(CONFIG)
+
+    assert table.points("blue jay", "2025-12-20T09:00:00") == 10
+    assert table.canonical_name("BLUE JAY") == "Blue Jay"
+
+
+def test_rescore_history():
+    table = Scoring(CONFIG)
+    entries = [
+        {"bird": "Nashville Warbler", "timestamp": "2025-12-20T09:00:00"},
+        {"bird": "Nashville Warbler", "timestamp": "2026-03-20T09:00:00"},
+        {"bird": "Eastern Phoebe", "timestamp": "2026-03-20T09:00:00"},
+    ]
+
+    assert table.rescore(entries) == [25, 10, 1]
+
+
+def test_bird_listed_twice_in_a_season_is_rejected():
+    config = {
+        **CONFIG,
+        "seasons": [
+            {
+                "id": "winter",
+                "starts": "2025-12-01",
+                "tiers": {"Common": ["Blue Jay"], "Rare": ["blue jay"]},
+            }
+        ],
+    }
+
+    with pytest.raises(ValueError, match="listed twice"):
+        Scoring(config)
+
+
+def test_unknown_tier_is_rejected():
+    config = {
+        **CONFIG,
+        "seasons": [
+            {"id": "winter", "starts": "2025-12-01", "tiers": {"Mythic": ["Blue Jay"]}}
+        ],
+    }
+
+    with pytest.raises(ValueError, match="Unknown tier"):
+        Scoring(config)